@@ -3,6 +3,7 @@
 # Licensed under the MIT License.
 # --------------------------------------------------------------------------
 
+import hashlib
 import logging
 import os
 import sys
@@ -976,6 +977,23 @@ class OnnxModel:
             return tensor1.raw_data == tensor2.raw_data
         return numpy_helper.to_array(tensor1) == numpy_helper.to_array(tensor2)
 
+    @staticmethod
+    def initializer_signature(tensor: TensorProto) -> Tuple[int, Tuple[int, ...], bytes]:
+        """Get a content signature of an initializer: data type, dims, and a hash of the tensor data.
+
+        Initializers with same value have equal signatures, so signatures can bucket candidates for
+        deduplication; a signature match shall be confirmed with has_same_value to rule out hash
+        collisions.
+
+        Args:
+            tensor (TensorProto): initializer to fingerprint
+
+        Returns:
+            Tuple[int, Tuple[int, ...], bytes]: signature of the initializer.
+        """
+        data = tensor.raw_data if tensor.HasField("raw_data") else numpy_helper.to_array(tensor).tobytes()
+        return (tensor.data_type, tuple(tensor.dims), hashlib.blake2b(data, digest_size=16).digest())
+
     def remove_duplicated_initializer(self):
         """Remove initializers with duplicated values, and only keep the first one.
         It could help reduce size of models (like ALBert) with shared weights.
@@ -986,13 +1004,17 @@ class OnnxModel:
 
         initializer_count = len(self.model.graph.initializer)
 
+        # Bucket initializers by a signature of data type, shape and content hash so that each
+        # initializer is compared against at most one candidate instead of all earlier ones.
         same = [-1] * initializer_count
-        for i in range(initializer_count - 1):
-            if same[i] >= 0:
-                continue
-            for j in range(i + 1, initializer_count):
-                if OnnxModel.has_same_value(self.model.graph.initializer[i], self.model.graph.initializer[j]):
-                    same[j] = i
+        signature_to_index = {}
+        for i in range(initializer_count):
+            initializer = self.model.graph.initializer[i]
+            signature = OnnxModel.initializer_signature(initializer)
+            first = signature_to_index.setdefault(signature, i)
+            # Compare value to guard against a hash collision; keep the first initializer.
+            if first != i and OnnxModel.has_same_value(self.model.graph.initializer[first], initializer):
+                same[i] = first
 
         count = 0
         for i in range(initializer_count):